@@ -1,5 +1,43 @@
-from fastsdk.fast_sdk import fastSDK, fastJob
-from fastsdk.web.service_client import ServiceClient
-from fastsdk.jobs.job_utils import gather_generator, gather_results
-from fastsdk.registry import Registry
-from media_toolkit import MediaFile, ImageFile, VideoFile, AudioFile
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # the real imports, so type checkers and IDEs resolve the lazily imported public names
+    from fastsdk.fast_sdk import fastSDK, fastJob
+    from fastsdk.web.service_client import ServiceClient
+    from fastsdk.jobs.job_utils import gather_generator, gather_results
+    from fastsdk.registry import Registry, get_registry
+    from media_toolkit import MediaFile, ImageFile, VideoFile, AudioFile
+
+# Public names are imported on first access (PEP 562).
+# This keeps "import fastsdk" cheap; media_toolkit, httpx and co. are only loaded when they are actually used.
+_LAZY_IMPORTS = {
+    "fastSDK": ("fastsdk.fast_sdk", "fastSDK"),
+    "fastJob": ("fastsdk.fast_sdk", "fastJob"),
+    "ServiceClient": ("fastsdk.web.service_client", "ServiceClient"),
+    "gather_generator": ("fastsdk.jobs.job_utils", "gather_generator"),
+    "gather_results": ("fastsdk.jobs.job_utils", "gather_results"),
+    "Registry": ("fastsdk.registry", "Registry"),
+    "get_registry": ("fastsdk.registry", "get_registry"),
+    "MediaFile": ("media_toolkit", "MediaFile"),
+    "ImageFile": ("media_toolkit", "ImageFile"),
+    "VideoFile": ("media_toolkit", "VideoFile"),
+    "AudioFile": ("media_toolkit", "AudioFile"),
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attr = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name), attr)
+    # cache the value, so __getattr__ is only called once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
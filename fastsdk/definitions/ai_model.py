@@ -2,8 +2,22 @@ from typing import Union
 
 from fastsdk.definitions.enums import ModelDomainTag
 
+# Enum value lookups (ModelDomainTag("text")) are slow. Known values are resolved with a plain dict instead.
+_MODEL_DOMAIN_TAG_BY_VALUE = {tag.value: tag for tag in ModelDomainTag}
+
+
+def _to_model_domain_tag(tag: Union[str, ModelDomainTag]) -> ModelDomainTag:
+    if not isinstance(tag, str):
+        return tag
+    domain_tag = _MODEL_DOMAIN_TAG_BY_VALUE.get(tag)
+    # unknown values still raise the ValueError of the enum
+    return domain_tag if domain_tag is not None else ModelDomainTag(tag)
+
 
 class AIModelDescription:
+    __slots__ = ("model_name", "model_version", "model_description", "model_domain_tags", "model_tags", "github_url",
+                 "paper_url")
+
     def __init__(
             self,
             model_name: str = None,
@@ -32,9 +46,9 @@ class AIModelDescription:
         if model_domain_tags is None:
             self.model_domain_tags = [ModelDomainTag.OTHER]
         elif isinstance(model_domain_tags, str):
-            self.model_domain_tags = [ModelDomainTag(model_domain_tags)]
+            self.model_domain_tags = [_to_model_domain_tag(model_domain_tags)]
         elif isinstance(model_domain_tags, list):
-            self.model_domain_tags = [ModelDomainTag(tag) if isinstance(tag, str) else tag for tag in model_domain_tags]
+            self.model_domain_tags = [_to_model_domain_tag(tag) for tag in model_domain_tags]
 
         self.model_tags = model_tags
         self.github_url = github_url
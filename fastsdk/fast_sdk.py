@@ -1,8 +1,8 @@
 import functools
+import inspect
 
 from fastCloud import FastCloud
-from fastsdk.jobs.threaded.internal_job import InternalJob
-from fastsdk.utils import get_function_parameters_as_dict
+from fastsdk.jobs.threaded.internal_job import InternalJob, _is_job_param
 from fastsdk.web.service_client import ServiceClient
 
 
@@ -51,6 +51,8 @@ def fastSDK(
         # Add new attributes and methods to the original class
         cls.__init__ = new_init
         cls.request = request
+        # marks the class for fastJob. Checked once per call instead of looking up the instance attributes.
+        cls._is_fast_sdk_class = True
 
         # Add the docstring to the original class
         # cls.__doc__ =
@@ -65,21 +67,26 @@ def fastJob(func):
     The wrapped method runs as a threaded internal job.
     A "job" parameter is passed to the function and can be used to send requests with the service client.
     """
+    # The signature of func without the "job" parameters. Computed once here instead of on every call.
+    # The arguments of a call (including self) are bound to it to get the job params.
+    job_func_signature = _get_signature_without_job_params(func)
+    # The job calls func with keyword arguments only (func(**job_params)). Values of *args can't be passed like that.
+    if any(p.kind == inspect.Parameter.VAR_POSITIONAL for p in job_func_signature.parameters.values()):
+        raise TypeError(f"fastJob function {func.__name__} can't have a *args parameter. Use named parameters instead.")
+    var_keyword_param = next(
+        (p.name for p in job_func_signature.parameters.values() if p.kind == inspect.Parameter.VAR_KEYWORD), None
+    )
+
     @functools.wraps(func)
     def wrapper(instance, *func_args, **func_kwargs) -> InternalJob:
         # check if the function is called from a fastsdk class:
-        if not hasattr(instance, "service_client") or not hasattr(instance, "request"):
+        if not getattr(type(instance), "_is_fast_sdk_class", False):
             raise RuntimeError("The fastJob decorator can only be used in a class decorated with fastSDK.")
 
-        # get the function names of the func and exclude "job" parameters
-        params = get_function_parameters_as_dict(
-            func=func,
-            exclude_param_names="job",
-            exclude_param_types=InternalJob,
-            func_args=func_args,
-            func_kwargs=func_kwargs
-        )
-        params["self"] = instance
+        # match the args and kwargs to the parameter names of func. The "job" parameter is added when the job runs.
+        params = job_func_signature.bind_partial(instance, *func_args, **func_kwargs).arguments
+        if var_keyword_param is not None and var_keyword_param in params:
+            params.update(params.pop(var_keyword_param))
         # ToDO: if a job func calls another job function, it should not spawn two jobs.
         job = InternalJob(
             job_function=func,
@@ -114,4 +121,12 @@ def fastJob(func):
     return wrapper
 
 
+def _get_signature_without_job_params(func: callable) -> inspect.Signature:
+    """
+    Returns the signature of func without the parameters that get the InternalJob passed (see _is_job_param).
+    """
+    signature = inspect.signature(func)
+    return signature.replace(parameters=[p for p in signature.parameters.values() if not _is_job_param(p)])
+
+
 
@@ -1,13 +1,20 @@
 import asyncio
-from concurrent.futures import Future
-from datetime import datetime
+import time
+from concurrent.futures import Future, CancelledError
+from datetime import datetime, timedelta
+from typing import Union
+
+from fastsdk.utils import monotonic_ns_to_datetime
 
 
 class AsyncJob:
+    # one instance per request and status refresh. Slots keep them small.
+    __slots__ = ("_future", "_coro", "coro_timeout", "delay", "created_at_ns", "future_result_received_at_ns",
+                 "coroutine_executed_at_ns", "_settled", "_result", "_error")
 
     def __init__(
             self,
-            future: Future,
+            future: Union[Future, None],
             coro,
             coro_timeout: int = 60,
             delay: float = None
@@ -17,58 +24,83 @@ class AsyncJob:
         self.coro_timeout = coro_timeout
         self.delay = delay
 
-        self.created_at = datetime.utcnow()
-        self.future_result_received_at = None
-        self.coroutine_executed_at = None
+        # timestamps of time.monotonic_ns(). The datetime versions are available as properties.
+        self.created_at_ns = time.monotonic_ns()
+        self.future_result_received_at_ns = None
+        self.coroutine_executed_at_ns = None
+
+        # result and error of the done future. See _settle.
+        self._settled = False
+        self._result = None
+        self._error = None
 
     @property
     def result(self):
         """
         :return: The server_response of the coroutine if it is done. Or None if it is not done.
         """
-        if self._future is None:
-            return None
-
-        if not self._future.done():
-            return None
-
-        if self.error is not None:
+        if not self._settle():
             return None
-
-        self.future_result_received_at = datetime.utcnow()
-        future_result = self._future.result()
-
-        return future_result
+        return self._result
 
     @property
     def error(self):
-        if self._future is None:
+        if not self._settle():
             return None
-        if not self._future.done():
-            return None
-        return self._future.exception()
+        return self._error
+
+    def _settle(self) -> bool:
+        """
+        Reads result and exception from the future once it is done and keeps them.
+        Later reads of result and error don't touch the future anymore.
+        :return: True if the job is done.
+        """
+        if self._settled:
+            return True
+        if self._future is None or not self._future.done():
+            return False
+
+        if self._future.cancelled():
+            # exception() would raise instead of returning it
+            self._error = CancelledError()
+        else:
+            self._error = self._future.exception()
+        self._result = self._future.result() if self._error is None else None
+        self._settled = True
+        return True
 
     async def run(self):
+        """
+        Executes the coroutine. Is wrapped by the AsyncJobManager with asyncio.run_coroutine_threadsafe.
+        The returned value or raised exception ends up in the future of the job.
+        """
+        self.coroutine_executed_at_ns = time.monotonic_ns()
         try:
-            self.coroutine_executed_at = datetime.utcnow()
             if self.delay is not None:
                 await asyncio.sleep(self.delay)
+            return await self._coro
+        finally:
+            self.future_result_received_at_ns = time.monotonic_ns()
 
-            result = await self._coro
-            self.future_result_received_at = datetime.utcnow()
-            self._future.set_result(result)
-        except Exception as e:
-            result = None
-            self._future.set_exception(e)
+    @property
+    def created_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.created_at_ns)
+
+    @property
+    def coroutine_executed_at(self) -> Union[datetime, None]:
+        return monotonic_ns_to_datetime(self.coroutine_executed_at_ns)
 
-        return result
+    @property
+    def future_result_received_at(self) -> Union[datetime, None]:
+        return monotonic_ns_to_datetime(self.future_result_received_at_ns)
 
-    def get_execution_time(self):
+    def get_execution_time(self) -> timedelta:
         """
         The interval_sec it took/takes to execute the job in seconds.
         """
         # still running
-        if self.future_result_received_at is None:
-            return datetime.utcnow() - self.created_at
+        end_ns = self.future_result_received_at_ns
+        if end_ns is None:
+            end_ns = time.monotonic_ns()
 
-        return self.future_result_received_at - self.created_at
+        return timedelta(microseconds=(end_ns - self.created_at_ns) // 1000)
@@ -1,11 +1,17 @@
 import asyncio
-import concurrent.futures
+import functools
 import threading
-import time
 from typing import Union
 
+import httpx
+
 from fastsdk.jobs.async_jobs.async_job import AsyncJob
 
+# Connection pool of the httpx client shared by the request handlers.
+# httpx closes idle connections after 5s by default, which is about the status refresh interval of long-running jobs.
+# Keeping them alive longer means the (TLS) connection is reused for every refresh call instead of reconnecting.
+HTTPX_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+
 
 class AsyncJobManager:
     """
@@ -19,6 +25,20 @@ class AsyncJobManager:
         self.loop: Union[asyncio.BaseEventLoop, None] = None
         self.lock = threading.Lock()
         self.thread = None
+        # set by the loop thread as soon as the event loop runs
+        self._loop_ready = threading.Event()
+        # pooled connections are bound to the event loop. The client is created per loop and closed on shutdown.
+        self._httpx_client: Union[httpx.AsyncClient, None] = None
+
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        """
+        The httpx client of the current event loop. The request handlers send their requests with it.
+        """
+        with self.lock:
+            if self._httpx_client is None:
+                self._httpx_client = httpx.AsyncClient(limits=HTTPX_LIMITS)
+            return self._httpx_client
 
     def _start_event_loop(self):
         """
@@ -26,6 +46,8 @@ class AsyncJobManager:
         """
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        # the first callback executed by the running loop signals waiting submitters
+        self.loop.call_soon(self._loop_ready.set)
         self.loop.run_forever()
 
     def _ensure_event_loop_running(self):
@@ -34,12 +56,13 @@ class AsyncJobManager:
         """
         with self.lock:
             if self.thread is None or not self.thread.is_alive():
-                self.thread = threading.Thread(target=self._start_event_loop)
+                self._loop_ready.clear()
+                # daemon: like the internal job threads, an idle loop must not keep the interpreter alive at exit
+                self.thread = threading.Thread(target=self._start_event_loop, daemon=True)
                 self.thread.start()
 
-            # wait until thread is running
-            while self.loop is None or not self.loop.is_running():
-                time.sleep(0.05)
+            # wait until the loop is running
+            self._loop_ready.wait()
 
     def submit(self, coro, callback: callable = None, delay: float = None) -> AsyncJob:
         """
@@ -54,23 +77,62 @@ class AsyncJobManager:
             A Future object representing the server_response of the coroutine.
         """
         self._ensure_event_loop_running()
-        future = concurrent.futures.Future()
 
-        async_job = AsyncJob(future=future, coro=coro, delay=delay)
+        async_job = AsyncJob(future=None, coro=coro, delay=delay)
+        # schedules the task in the loop thread and returns a concurrent.futures.Future with its result
+        async_job._future = asyncio.run_coroutine_threadsafe(async_job.run(), self.loop)
 
         if callback is not None:
             # modify callback to return the async_jobs job
-            _callback = lambda f: callback(async_job)
-            future.add_done_callback(_callback)
-
-        self.loop.call_soon_threadsafe(asyncio.create_task, async_job.run())
+            async_job._future.add_done_callback(lambda f: callback(async_job))
 
         return async_job
 
-    def shutdown(self):
+    def shutdown(self, timeout: float = 5):
         """
         Shuts down the AsyncJobManager, stopping the event loop and cleaning up resources.
+        Pending coroutines are cancelled; their jobs end with a CancelledError.
+        The httpx client and its pooled connections are closed with the loop.
+        The manager can be used again afterward. A new event loop and httpx client are created with the next request.
+        :param timeout: seconds to wait for the event loop thread to end.
+        """
+        with self.lock:
+            loop, thread, httpx_client = self.loop, self.thread, self._httpx_client
+            self._httpx_client = None
+            if loop is None or thread is None:
+                return
+
+            if thread.is_alive():
+                asyncio.run_coroutine_threadsafe(self._cancel_tasks_and_stop(httpx_client), loop)
+                thread.join(timeout)
+
+            # a loop can only be closed once it stopped running
+            if not thread.is_alive():
+                loop.close()
+
+            self.loop = None
+            self.thread = None
+            self._loop_ready.clear()
+
+    @staticmethod
+    async def _cancel_tasks_and_stop(httpx_client: Union[httpx.AsyncClient, None] = None):
+        """
+        Cancels all other tasks of the running loop, waits until they handled the cancellation and stops the loop.
+        :param httpx_client: closed after the tasks, while its connections can still be closed on the loop.
         """
-        if self.loop:
-            self.loop.call_soon_threadsafe(self.loop.stop)
-            self.thread.join()
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if httpx_client is not None:
+            await httpx_client.aclose()
+        asyncio.get_running_loop().stop()
+
+
+@functools.lru_cache(maxsize=None)
+def get_async_job_manager() -> AsyncJobManager:
+    """
+    Returns the AsyncJobManager shared by all request handlers, created on first use.
+    This way all requests run on one event loop thread, instead of one thread per service.
+    """
+    return AsyncJobManager()
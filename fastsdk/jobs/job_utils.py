@@ -1,4 +1,4 @@
-import time
+import queue
 from typing import Union, List
 
 from tqdm import tqdm
@@ -16,8 +16,14 @@ def gather_generator(jobs: Union[List[InternalJob], List[List[InternalJob]], Int
     if not isinstance(jobs, list):
         jobs = [jobs]
 
-    # flatten array
-    jobs: List[InternalJob] = list(flatten_list(jobs))
+    # flatten array. Duplicates are removed; every job is yielded once.
+    jobs: List[InternalJob] = list(dict.fromkeys(flatten_list(jobs)))
+
+    # the jobs put themselves into the queue once they are finished. No polling of the job states necessary.
+    finished_jobs = queue.Queue()
+    for job in jobs:
+        job.add_done_callback(finished_jobs.put)
+
     # start jobs that not have been started
     for job in jobs:
         if job.status == JOB_STATUS.CREATED:
@@ -25,18 +31,13 @@ def gather_generator(jobs: Union[List[InternalJob], List[List[InternalJob]], Int
 
     # with progress bar
     pbar_total = tqdm(total=len(jobs))
-    finished_jobs = []
-    while len(jobs) > len(finished_jobs):
-        for i, job in enumerate(jobs):
-            if job.finished() and job not in finished_jobs:
-                finished_jobs.append(job)
-                yield job
-        # update progress bar
-        pbar_total.update(len(finished_jobs))
-        # give the cpu a break
-        time.sleep(0.1)
-
-    pbar_total.close()
+    try:
+        for _ in range(len(jobs)):
+            job = finished_jobs.get()
+            pbar_total.update(1)
+            yield job
+    finally:
+        pbar_total.close()
 
 
 def gather_results(jobs: Union[List[InternalJob], List[InternalJob], InternalJob, list]) -> List[InternalJob]:
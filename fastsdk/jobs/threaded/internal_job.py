@@ -1,19 +1,38 @@
 import inspect
-import itertools
+import logging
+import os
+import threading
 import time
 import traceback
+import weakref
 from datetime import datetime
 from typing import Union
-from uuid import uuid4
 from tqdm import tqdm
 
 from fastsdk.jobs.threaded.internal_job_manager import InternalJobManager
-from fastsdk.jobs.threaded.job_status import JOB_STATUS
+from fastsdk.jobs.threaded.job_status import JOB_STATUS, FINISHED_JOB_STATUSES, STARTED_JOB_STATUSES
 from fastsdk.jobs.threaded.job_progress import JobProgress
+from fastsdk.utils import monotonic_ns_to_datetime
 from fastsdk.web.req.endpoint_request import EndPointRequest
 
+# { job_function: names of the parameters the job is injected into }. inspect.signature is slow and the same
+# job function is run many times. Weak keys don't keep job functions alive.
+_JOB_PARAM_NAMES_CACHE = weakref.WeakKeyDictionary()
+
+logger = logging.getLogger(__name__)
+
+# progress spinner of get_result. Every symbol is shown for two ticks.
+_SPINNER = ('◐', '◐', '◓', '◓', '◑', '◑', '◒', '◒')
+
 
 class InternalJob:
+    # one instance is created per job submission. Slots keep them small and the attribute access fast.
+    __slots__ = (
+        "id", "_job_function", "_job_params", "status", "job_progress", "_request_function",
+        "_ongoing_async_request", "result", "error", "_done_callbacks", "_done_callbacks_lock", "_done_event",
+        "created_at_ns", "queued_at_ns", "started_at_ns", "finished_at_ns"
+    )
+
     def __init__(
             self,
             job_function: callable,
@@ -33,7 +52,7 @@ class InternalJob:
         :_job_params (dict): Parameters for the function call
         :request_function (callable): Function to send requests.
         """
-        self.id = str(uuid4())
+        self.id = os.urandom(16).hex()  # 128 random bits like uuid4, without building the UUID object
         self._job_function = job_function
         self._job_params = job_params
         self.status: JOB_STATUS = JOB_STATUS.CREATED
@@ -46,11 +65,33 @@ class InternalJob:
         self.result = None
         self.error = None
 
-        # statistics
-        self.created_at = datetime.utcnow()
-        self.queued_at = None
-        self.started_at = None
-        self.finished_at = None
+        # called with the job once it finished (or failed). Guarded by the lock, because jobs finish in worker threads.
+        self._done_callbacks = []
+        self._done_callbacks_lock = threading.Lock()
+        # set once the job finished or failed. Waiting threads block on it instead of polling the status.
+        self._done_event = threading.Event()
+
+        # statistics. Timestamps of time.monotonic_ns(). The datetime versions are available as properties.
+        self.created_at_ns = time.monotonic_ns()
+        self.queued_at_ns = None
+        self.started_at_ns = None
+        self.finished_at_ns = None
+
+    @property
+    def created_at(self) -> datetime:
+        return monotonic_ns_to_datetime(self.created_at_ns)
+
+    @property
+    def queued_at(self) -> Union[datetime, None]:
+        return monotonic_ns_to_datetime(self.queued_at_ns)
+
+    @property
+    def started_at(self) -> Union[datetime, None]:
+        return monotonic_ns_to_datetime(self.started_at_ns)
+
+    @property
+    def finished_at(self) -> Union[datetime, None]:
+        return monotonic_ns_to_datetime(self.finished_at_ns)
 
     def request(self, endpoint_route: str, *args, **kwargs) -> EndPointRequest:
         self._ongoing_async_request = self._request_function(endpoint_route, True, *args, **kwargs)
@@ -68,46 +109,52 @@ class InternalJob:
         :param throw_error: If true, the error is raised if the job failed.
         """
 
-        spinning_wheel = itertools.cycle(['◐', '◐', '◓', '◓', '◑', '◑', '◒', '◒'])
+        fn_name = self._job_function.__name__
+        tick = 0
         if print_progress:
             pbar = tqdm(total=100, bar_format="{desc}")
-            desc = f"{self._job_function.__name__}, status: initializing, {next(spinning_wheel)}"
+            desc = f"{fn_name}, status: initializing, {_SPINNER[0]}"
             pbar.set_description(desc)
 
+        if not print_progress:
+            self._done_event.wait()
+
         job_id = None
-        while not self.finished():
-            job_id = (
-                self._ongoing_async_request.job_id
-                if self._ongoing_async_request and self._ongoing_async_request.job_id
-                else None
-            )
-            if print_progress:
-                if job_id is None:
-                    desc = f"{self._job_function.__name__}, status: preparing request, {next(spinning_wheel)}"
-                else:
-                    progress, message = self.progress
-                    if progress > 0:
-                        desc = (
-                            f"{self._job_function.__name__}, job_id: {job_id}, "
-                            f"status []: {self.status.name}, progress: {progress:.0%},  {next(spinning_wheel)}"
-                        )
-                    else:
-                        desc = (
-                            f"{self._job_function.__name__}, job_id: {job_id}, "
-                            f"status: {self.status.name}, {next(spinning_wheel)}"
-                        )
-                pbar.set_description(desc)
-                time.sleep(0.1)
+        last_state = None
+        last_spinner = None
+        # refreshes the progress bar every 0.1s, but returns immediately once the job is done
+        while print_progress and not self._done_event.wait(0.1):
+            tick += 1
+            spinner = _SPINNER[tick % len(_SPINNER)]
+            request = self._ongoing_async_request
+            job_id = request.job_id if request is not None else None
+            progress = self.progress[0] if job_id is not None else 0
+
+            # only redraw if the state or the spinner symbol changed. Every symbol is shown for two ticks.
+            state = (job_id, self.status, round(progress * 100))
+            if state == last_state and spinner == last_spinner:
+                continue
+            last_state, last_spinner = state, spinner
+
+            if job_id is None:
+                desc = f"{fn_name}, status: preparing request, {spinner}"
+            elif progress > 0:
+                desc = (
+                    f"{fn_name}, job_id: {job_id}, "
+                    f"status []: {self.status.name}, progress: {progress:.0%},  {spinner}"
+                )
+            else:
+                desc = f"{fn_name}, job_id: {job_id}, status: {self.status.name}, {spinner}"
+            pbar.set_description(desc)
 
         if print_progress:
+            if self._ongoing_async_request is not None and self._ongoing_async_request.job_id:
+                job_id = self._ongoing_async_request.job_id
             progress, message = self.progress
             if self.status is JOB_STATUS.FINISHED and job_id:
-                final_desc = (
-                    f"{self._job_function.__name__}, job_id: {job_id}, "
-                    f"status: {self.status.name}, progress: {progress:.0%}"
-                )
+                final_desc = f"{fn_name}, job_id: {job_id}, status: {self.status.name}, progress: {progress:.0%}"
             else:
-                final_desc = f"{self._job_function.__name__}, status: {self.status.name}"
+                final_desc = f"{fn_name}, status: {self.status.name}"
 
             pbar.set_description(final_desc)
             pbar.close()
@@ -121,18 +168,41 @@ class InternalJob:
         """
         Returns true if job has ended. Either completed or by error.
         """
-        return self.status in [JOB_STATUS.FINISHED, JOB_STATUS.FAILED]
+        return self.status in FINISHED_JOB_STATUSES
+
+    def add_done_callback(self, callback: callable):
+        """
+        Registers a callback which is called with the job as argument once the job finished or failed.
+        If the job already ended, the callback is called immediately.
+        The callback runs in the thread that finished the job. It should be short and must not block.
+        """
+        with self._done_callbacks_lock:
+            if not self.finished():
+                self._done_callbacks.append(callback)
+                return
+        callback(self)
+
+    def _call_done_callbacks(self):
+        with self._done_callbacks_lock:
+            callbacks, self._done_callbacks = self._done_callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception:
+                logger.exception("done callback of job %s failed", self.id)
 
     def has_started(self):
-        return self.status in [JOB_STATUS.QUEUED, JOB_STATUS.PROCESSING]
+        return self.status in STARTED_JOB_STATUSES
 
     def wait_for_finished(
             self,
-            wait_for_request_result: bool = False
+            wait_for_request_result: bool = False,
+            timeout: float = None
     ):
         """
         This waits until the underlying _job function returns a server_response.
         :param wait_for_request_result: If there was a request send with the request function, this waits also until the server_response is finished.
+        :param timeout: maximum time in seconds to wait for the job. None waits until the job is finished.
         """
         if not self.has_started() and not self.finished():
             self.run()
@@ -140,10 +210,17 @@ class InternalJob:
         if wait_for_request_result:
             self.wait_for_request_result()
 
-        while not self.finished():
-            time.sleep(0.1)
+        self._done_event.wait(timeout)
         return self
 
+    def format_traceback(self) -> Union[str, None]:
+        """
+        Returns the formatted traceback of the error that made the job fail. None if the job didn't fail.
+        """
+        if self.error is None:
+            return None
+        return "".join(traceback.format_exception(type(self.error), self.error, self.error.__traceback__))
+
     def wait_for_request_result(self):
         """
         Waits until the request send with the job argument is finished.
@@ -166,9 +243,8 @@ class InternalJob:
         self.job_progress.set_progress(progress, message)
 
     def _add_job_progress_to_kwargs(self):
-        for param in inspect.signature(self._job_function).parameters.values():
-            if param.annotation == InternalJob or param.name == "job":
-                self._job_params[param.name] = self
+        for name in _get_job_param_names(self._job_function):
+            self._job_params[name] = self
 
         return self._job_params
 
@@ -177,19 +253,26 @@ class InternalJob:
         function is called by internal job manager when job is executed
         """
         # run job
-        self.started_at = datetime.utcnow()
+        self.started_at_ns = time.monotonic_ns()
         self.status = JOB_STATUS.PROCESSING
 
         try:
             self._add_job_progress_to_kwargs()  # add to job to jub_function if is in signature
             self.result = self._job_function(**self._job_params)
             self.set_progress(1.0, None)
+            self.finished_at_ns = time.monotonic_ns()
             self.status = JOB_STATUS.FINISHED
         except Exception as e:
-            self.status = JOB_STATUS.FAILED
             self.error = e
-            self.finished_at = datetime.utcnow()
-            print(traceback.format_exc())
+            self.finished_at_ns = time.monotonic_ns()
+            self.status = JOB_STATUS.FAILED
+            # jobs that are never waited for (or with throw_error=False) don't re-raise. This log is all there is.
+            # Without logging configuration, the last resort handler still prints it with the traceback to stderr.
+            logger.exception("job %s failed", self.id)
+        finally:
+            self._done_event.set()
+
+        self._call_done_callbacks()
 
     def run_sync(self):
         return self.run(run_async=False)
@@ -201,3 +284,29 @@ class InternalJob:
         return self
 
 
+def _is_job_param(param: inspect.Parameter) -> bool:
+    """
+    Returns True if the InternalJob is passed to the parameter of a job function.
+    Those are parameters named "job" or annotated with InternalJob. String annotations
+    (also the ones of "from __future__ import annotations") count as well.
+    """
+    return param.name.lower() == "job" or param.annotation is InternalJob or param.annotation == "InternalJob"
+
+
+def _get_job_param_names(job_function: callable) -> list:
+    """
+    Returns the names of the parameters of job_function which receive the InternalJob.
+    """
+    try:
+        names = _JOB_PARAM_NAMES_CACHE.get(job_function)
+    except TypeError:  # not weak referenceable
+        names = None
+    if names is not None:
+        return names
+
+    names = [param.name for param in inspect.signature(job_function).parameters.values() if _is_job_param(param)]
+    try:
+        _JOB_PARAM_NAMES_CACHE[job_function] = names
+    except TypeError:
+        pass
+    return names
@@ -11,3 +11,9 @@ class JOB_STATUS(Enum):
     FAILED = "failed"  # internal package error
     REQUEST_TIMEOUT = "request_timeout"  # request took too long
     FINISHED = "finished"
+
+
+# a job in one of these states has ended. Either completed or by error.
+FINISHED_JOB_STATUSES = frozenset({JOB_STATUS.FINISHED, JOB_STATUS.FAILED})
+# a job in one of these states was submitted and has not ended yet.
+STARTED_JOB_STATUSES = frozenset({JOB_STATUS.QUEUED, JOB_STATUS.PROCESSING})
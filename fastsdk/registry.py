@@ -4,30 +4,35 @@ from typing import Dict, TYPE_CHECKING, Union
 if TYPE_CHECKING:
     from fastsdk import ServiceClient
 
-from singleton_decorator import singleton
+
+# { service_name: ServiceClient } shared by all Registry instances
+_SERVICES = {}
 
 
-@singleton
 class Registry:
     """
     The registry holds all references to services which were instantiated.
     It provides functions, to list and search services and endpoints.
+    Use the module instance fastsdk.registry.registry. All instances share the same services,
+    so code that calls Registry() (formerly a singleton) sees the same services as well.
     """
+    __slots__ = ("_services",)
+
     def __init__(self):
-        self._services = {}
+        self._services = _SERVICES
 
     def add_service(self, name: str, obj: ServiceClient):
-        if name is None or not isinstance(name, str):
+        # type() is str is the common case and cheaper than isinstance. None fails both checks.
+        if type(name) is not str and not isinstance(name, str):
             raise ValueError("service_name must be given and be a string.")
 
         self._services[name] = obj
 
     def remove_service(self, service: Union[ServiceClient, str]):
-        if isinstance(service, str):
-            self._services.pop(service)
-        elif isinstance(service, ServiceClient):
-            self._services.pop(service.service_name)
-
+        # ServiceClient is only imported for type checking. Service clients are recognized by their service_name.
+        name = service if type(service) is str or isinstance(service, str) else getattr(service, "service_name", None)
+        if name is not None:
+            self._services.pop(name)
 
     def get_services(self) -> Dict[str, ServiceClient]:
         return self._services
@@ -38,4 +43,15 @@ class Registry:
         :return: a list of endpoint names
         """
         for name, srvc in self._services.items():
-            print(f"{name}: {srvc.list_endpoints()}")
\ No newline at end of file
+            print(f"{name}: {srvc.list_endpoints()}")
+
+
+# The registry instance used by the package.
+registry = Registry()
+
+
+def get_registry() -> Registry:
+    """
+    Returns the registry instance used by the package.
+    """
+    return registry
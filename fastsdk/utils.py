@@ -1,8 +1,15 @@
-import inspect
+import json
+import time
+from datetime import datetime, timedelta
 from typing import Union, Any
 import os
 from collections.abc import Iterable
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 def is_valid_file_path(path: str):
     try:
@@ -12,40 +19,34 @@ def is_valid_file_path(path: str):
         return False
 
 
-def get_function_parameters_as_dict(
-        func: callable,
-        exclude_param_names: Union[list, str] = None,
-        exclude_param_types: Union[list, Any] = None,
-        func_args: Union[list, tuple] = None,
-        func_kwargs: dict = None
-):
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parses json with orjson if it is installed, otherwise with the standard library json module.
+    Both raise a json.JSONDecodeError on invalid input.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serializes data to json bytes with orjson if it is installed, otherwise with the standard library json module.
+    The bytes can be sent directly as request content.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode("utf-8")
+
+
+def monotonic_ns_to_datetime(monotonic_ns: Union[int, None]) -> Union[datetime, None]:
     """
-    Get the parameters of a function as a dict
-    :param func: the function to get the parameters from
-    :param exclude_param_names: the names of the parameters to exclude
-    :param exclude_param_types: the types of the parameters to exclude
-    :param func_args: the arguments of the function at runtime
-    :param func_kwargs: the keyword arguments of the function at runtime
-    :return: a dict with the parameters as key and the value as value
+    Converts a time.monotonic_ns() timestamp to a (naive, utc) datetime.
+    Timestamps are taken with the cheap monotonic clock; the datetime is only created when it is actually read.
     """
-    if isinstance(exclude_param_names, str):
-        exclude_param_names = [exclude_param_names]
-    if not isinstance(exclude_param_types, list):
-        exclude_param_types = [exclude_param_types]
-    exclude_param_names = [p.lower() for p in exclude_param_names]
-
-    named_func_params = [
-        p for p in inspect.signature(func).parameters.values()
-        if p.annotation not in exclude_param_types
-        and p.name.lower() not in exclude_param_names
-    ]
-    # fill params in order of kwargs
-    params = {}
-    for i, arg in enumerate(func_args):
-        params[named_func_params[i].name] = arg
-    # add the kwargs
-    params.update(func_kwargs)
-    return params
+    if monotonic_ns is None:
+        return None
+    return datetime.utcnow() - timedelta(microseconds=(time.monotonic_ns() - monotonic_ns) // 1000)
 
 
 def flatten_list(xs):
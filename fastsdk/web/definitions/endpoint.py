@@ -7,6 +7,9 @@ class EndPoint:
     """
     Defines with which parameters a request to an endpoint can be made.
     """
+    __slots__ = ("endpoint_route", "timeout", "refresh_interval_s", "max_refresh_interval_s", "query_params",
+                 "body_params", "file_params", "has_file_params", "headers")
+
     def __init__(
             self,
             endpoint_route: str,
@@ -15,7 +18,8 @@ class EndPoint:
             file_params: dict = None,
             header_params: dict = None,
             timeout: float = 3600,
-            refresh_interval_s: float = 1.0
+            refresh_interval_s: float = 1.0,
+            max_refresh_interval_s: float = 5.0
     ):
         """
         :param endpoint_route: for example api/img2img/stable_diffusion
@@ -27,13 +31,18 @@ class EndPoint:
         :param header_params: Additional headers to be sent with the request.
         :param timeout: time in seconds until the request to the endpoint fails.
         :param refresh_interval_s: in which interval in seconds is the status checkpoint called.
+            The interval grows with every refresh call (exponential backoff) until max_refresh_interval_s is reached.
+        :param max_refresh_interval_s: upper bound in seconds for the refresh interval.
         """
         self.endpoint_route = endpoint_route.strip("/")  # remove slash at beginning and end
         self.timeout = timeout
         self.refresh_interval_s = refresh_interval_s
+        self.max_refresh_interval_s = max(refresh_interval_s, max_refresh_interval_s)
         self.query_params = query_params if query_params is not None else {}
         self.body_params = body_params if body_params is not None else {}
         self.file_params = file_params if file_params is not None else {}
+        # determined once, so requests to endpoints without files skip all file handling
+        self.has_file_params = bool(self.file_params)
         self.headers = header_params if header_params is not None else {}
 
     def get_parameter_definition_as_dict(self):
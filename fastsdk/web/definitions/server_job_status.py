@@ -16,23 +16,26 @@ class ServerJobStatus(Enum):
 
     @staticmethod
     def from_str(status: str):
-        if str is None:
+        if status is None:
             return ServerJobStatus.UNKNOWN
 
-        status = status.upper()
+        return _SERVER_JOB_STATUS_BY_STR.get(status.upper(), ServerJobStatus.UNKNOWN)
 
-        # runpod reparse
-        runpod_status_map = {
-            "IN_QUEUE": ServerJobStatus.QUEUED,
-            "IN_PROGRESS": ServerJobStatus.PROCESSING,
-            "COMPLETED": ServerJobStatus.FINISHED,
-            "TIMED_OUT": ServerJobStatus.TIMEOUT,
-        }
-        if status in runpod_status_map:
-            return runpod_status_map[status]
 
-        # else it should be an ordinary status
-        try:
-            return ServerJobStatus(status)
-        except Exception as e:
-            return ServerJobStatus.UNKNOWN
+# Maps every accepted (upper case) status string to its ServerJobStatus. Built once instead of on every from_str call.
+_SERVER_JOB_STATUS_BY_STR = {status.value: status for status in ServerJobStatus}
+# runpod reparse
+_SERVER_JOB_STATUS_BY_STR.update({
+    "IN_QUEUE": ServerJobStatus.QUEUED,
+    "IN_PROGRESS": ServerJobStatus.PROCESSING,
+    "COMPLETED": ServerJobStatus.FINISHED,
+    "TIMED_OUT": ServerJobStatus.TIMEOUT,
+})
+
+# a job in one of these states won't change anymore on the server. Refreshing it is pointless.
+TERMINAL_SERVER_JOB_STATUSES = frozenset({
+    ServerJobStatus.FINISHED,
+    ServerJobStatus.FAILED,
+    ServerJobStatus.TIMEOUT,
+    ServerJobStatus.CANCELLED
+})
@@ -3,51 +3,67 @@ import json
 import httpx
 
 
+from fastsdk.utils import json_loads
 from fastsdk.web.definitions.server_response.base_response import BaseJobResponse, RunpodJobResponse
 from fastsdk.web.definitions.server_response.response_parser_strategies import SocaityResponseParser, \
     RunpodResponseParser, ReplicateResponseParser
 
+# error messages for well known status codes. Only formatted when such a status is actually returned.
+_STATUS_ERROR_TEMPLATES = {
+    401: "Endpoint {url} error: Unauthorized. Did you forget to set the API key?",
+    403: "Endpoint {url} error: Unauthorized. Did you forget to set the API key?",
+    404: "Endpoint {url} error: not found. Check the URL and API key.",
+}
+
+# Status codes of transient errors. A request that received one of these can be sent again.
+# 500 is not part of it: the server might have started the (non-idempotent) job already.
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 502, 503, 504})
+# The first request may create a job. After a 408, 502 or 504 the upstream might have accepted it already.
+# It is only sent again if the server refused it before processing (rate limit, service unavailable).
+FIRST_REQUEST_RETRYABLE_STATUS_CODES = frozenset({429, 503})
+
 
 class ResponseParser:
-    def __init__(self):
-        self.strategies = [
-            SocaityResponseParser(),
-            RunpodResponseParser(),
-            ReplicateResponseParser()
-        ]
+    # the strategies are stateless and shared by all parser instances
+    strategies = (
+        SocaityResponseParser(),
+        RunpodResponseParser(),
+        ReplicateResponseParser()
+    )
 
     def parse_response(self, response: httpx.Response) -> Union[BaseJobResponse, bytes, None]:
         """Parse HTTP response into appropriate response object."""
         if not response:
             return None
 
-        if "application/json" not in response.headers.get("Content-Type", ""):
+        if not response.headers.get("content-type", "").startswith("application/json"):
             return response.content
 
         try:
-            data = response.json()
-
-            # Try each parser strategy
-            for strategy in self.strategies:
-                if strategy.can_parse(data):
-                    parsed_response = strategy.parse(data)
+            return self._parse_data(json_loads(response.content))
+        except json.JSONDecodeError:
+            return response.content
 
-                    # Handle nested Runpod output
-                    if isinstance(parsed_response, RunpodJobResponse) and isinstance(parsed_response.result, str):
-                        try:
-                            nested_data = json.loads(parsed_response.result)
-                            if any(strategy.can_parse(nested_data) for strategy in self.strategies):
-                                nested_response = self.parse_response(httpx.Response(200, json=nested_data))
-                                parsed_response.update(nested_response)
-                        except json.JSONDecodeError:
-                            pass
+    def _parse_data(self, data) -> Union[BaseJobResponse, dict, list, None]:
+        """Parse already decoded json data into the matching response object."""
+        # Try each parser strategy
+        for strategy in self.strategies:
+            if strategy.can_parse(data):
+                parsed_response = strategy.parse(data)
 
-                    return parsed_response
+                # Handle nested Runpod output
+                # the nested json is parsed directly instead of being wrapped in a new httpx.Response again
+                if isinstance(parsed_response, RunpodJobResponse) and isinstance(parsed_response.result, str):
+                    try:
+                        nested_response = self._parse_data(json_loads(parsed_response.result))
+                        if isinstance(nested_response, BaseJobResponse):
+                            parsed_response.update(nested_response)
+                    except json.JSONDecodeError:
+                        pass
 
-            return data  # Return raw JSON if no parser matches
+                return parsed_response
 
-        except json.JSONDecodeError:
-            return response.content
+        return data  # Return raw JSON if no parser matches
 
     @staticmethod
     def check_response_status(response: httpx.Response) -> Optional[str]:
@@ -55,15 +71,11 @@ class ResponseParser:
         if response.status_code == 200:
             return None
 
-        error_messages = {
-            401: f"Endpoint {response.url} error: Unauthorized. Did you forget to set the API key?",
-            403: f"Endpoint {response.url} error: Unauthorized. Did you forget to set the API key?",
-            404: f"Endpoint {response.url} error: not found. Check the URL and API key.",
-        }
-
-        if response.status_code in error_messages:
-            return error_messages[response.status_code]
-        elif response.status_code >= 400:
+        status_code = response.status_code
+        template = _STATUS_ERROR_TEMPLATES.get(status_code)
+        if template is not None:
+            return template.format(url=response.url)
+        if status_code >= 400:
             return f"Endpoint {response.url} error: {response.content}."
 
-        return None
\ No newline at end of file
+        return None
@@ -3,6 +3,9 @@ from urllib.parse import urlparse
 
 from fastsdk.definitions.enums import EndpointSpecification
 
+# prefixes of absolute urls. A single startswith with the tuple instead of substring scans for "http".
+_URL_SCHEMES = ("http://", "https://")
+
 
 class ServiceAddress:
     def __init__(self, address: Union[str, dict]):
@@ -20,7 +23,7 @@ class ServiceAddress:
         Add http: // if not present and remove trailing slash
         """
         url = url.strip("/")  # remove prefix and suffix slashes
-        if not url.startswith("http") and not url.startswith("https"):
+        if not url.startswith(_URL_SCHEMES):
             url = f"http://{url}"
         return url
 
@@ -47,7 +50,7 @@ class RunpodServiceAddress(ServiceAddress):
         runpod_url = "https://api.runpod.ai/v2/"
 
         # if the url is not a full url, assume that it is a pod_id
-        if 'http' not in url:
+        if not url.startswith(_URL_SCHEMES):
             if "localhost" in url:
                 # case localhost:port/pod_id/run
                 url = f"http://{url}"
@@ -88,13 +91,12 @@ class SocaityServiceAddress(ServiceAddress):
 
 class ReplicateServiceAddress(ServiceAddress):
     def __init__(self, address: str = None, model_name: str = None, version: str = None):
-        if address:
-            self.url, self.model_name, self.version = self.parse_url(address)
-        elif not address and model_name:
-            self.url, self.model_name, self.version = self.parse_url(model_name)
-        elif not address and not model_name and version:
-            self.url, self.model_name, self.version = self.parse_url(version)
+        # the first given input in order of precedence is parsed. parse_url understands all of them.
+        source = next((src for src in (address, model_name, version) if src), None)
+        if source is None:
+            raise ValueError("couldn't parse replicate address. Check inputs")
 
+        self.url, self.model_name, self.version = self.parse_url(source)
         if not self.url and not self.model_name and not self.version:
             raise ValueError("couldn't parse replicate address. Check inputs")
 
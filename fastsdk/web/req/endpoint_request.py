@@ -1,20 +1,39 @@
+import functools
 import traceback
 from copy import copy
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Union, Any
 
-from httpx import HTTPStatusError
+import httpx
 
 from fastsdk.web.definitions.server_response.base_response import BaseJobResponse, SocaityJobResponse, RunpodJobResponse
-from fastsdk.web.definitions.server_response.response_parser import ResponseParser
+from fastsdk.web.definitions.server_response.response_parser import ResponseParser, RETRYABLE_STATUS_CODES, \
+    FIRST_REQUEST_RETRYABLE_STATUS_CODES
 from fastsdk.web.req.request_handler import RequestHandler
 from media_toolkit import MediaFile
 from media_toolkit.utils.file_conversion import media_from_file_result
 from fastsdk.jobs.async_jobs.async_job import AsyncJob
 from fastsdk.web.definitions.endpoint import EndPoint
-from fastsdk.web.definitions.server_job_status import ServerJobStatus
+from fastsdk.web.definitions.server_job_status import ServerJobStatus, TERMINAL_SERVER_JOB_STATUSES
 
-import time
+import random
+import threading
+
+# the refresh interval grows by this factor with every refresh call until the endpoint's max_refresh_interval_s
+REFRESH_BACKOFF_FACTOR = 1.25
+# lower bound in seconds for the refresh interval. An interval of 0 would poll the server in a busy loop.
+MIN_REFRESH_INTERVAL_S = 0.1
+# +- relative random jitter, so that many concurrent jobs don't poll the server in lockstep
+REFRESH_JITTER = 0.1
+
+# retries of transient errors (rate limits, gateway errors, timeouts) wait base * 2^attempt + jitter seconds
+RETRY_BASE_DELAY_S = 0.5
+RETRY_MAX_DELAY_S = 10.0
+RETRY_JITTER_S = 0.25
+
+# the parser is stateless. One instance is shared by all requests instead of creating one per response.
+_RESPONSE_PARSER = ResponseParser()
 
 
 class EndPointRequest:
@@ -28,6 +47,14 @@ class EndPointRequest:
         -  The class sends req to the refresh status url until the job is finished.
         -  To do so, it submits more async_jobs req with callbacks with the request handler.
     """
+    # one instance is created per endpoint call. Slots keep them small and the attribute access fast.
+    __slots__ = (
+        "_endpoint", "_request_handler", "_refresh_delay", "_max_refresh_interval",
+        "_retries_on_error", "_current_retry_counter", "_send_last_request", "_ongoing_async_request",
+        "_finished_event", "server_response", "error", "in_between_server_response", "first_request_send_at",
+        "first_response_received_at", "queued_on_server_at", "processing_on_server_at", "finished_on_server_at"
+    )
+
     def __init__(
             self,
             endpoint: EndPoint,
@@ -37,13 +64,20 @@ class EndPointRequest:
         self._endpoint = endpoint
         self._request_handler = request_handler
 
-        self._refresh_interval = endpoint.refresh_interval_s
+        # delay of the next refresh call. Grows with every refresh call until the max refresh interval.
+        self._refresh_delay = max(endpoint.refresh_interval_s, MIN_REFRESH_INTERVAL_S)
+        self._max_refresh_interval = max(endpoint.max_refresh_interval_s, MIN_REFRESH_INTERVAL_S)
         self._retries_on_error = retries_on_error
         self._current_retry_counter = 0
+        # sends the last request (first request or refresh call). Called again with a delay in seconds on retries.
+        self._send_last_request = None
 
         # the AsyncJob that is currently executed in the AsyncJobManager as coroutine task
         self._ongoing_async_request = None
 
+        # set once server_response or error is final. wait_until_finished blocks on it.
+        self._finished_event = threading.Event()
+
         # public attributes to get the server_response
         self.server_response: Union[BaseJobResponse, None] = None
         self.error = None
@@ -72,14 +106,14 @@ class EndPointRequest:
 
     @property
     def queue_time_ms(self):
-        if self.queued_on_server_at is None:
+        if self.queued_on_server_at is None or self.processing_on_server_at is None:
             return None
 
         return (self.processing_on_server_at - self.queued_on_server_at).total_seconds() * 1000
 
     @property
     def processing_time_ms(self):
-        if self.processing_on_server_at is None:
+        if self.processing_on_server_at is None or self.finished_on_server_at is None:
             return None
         return (self.finished_on_server_at - self.processing_on_server_at).total_seconds() * 1000
 
@@ -89,14 +123,15 @@ class EndPointRequest:
         That submits a coroutine which server_response is retrieved with a callback self._response_callback.
             - In the callback it is checked for errors, response types and if the request is refreshed.
         """
-        self._ongoing_async_request = self._request_handler.request_endpoint(
-            self._endpoint,
-            self._response_callback,
-            *args,
-            **kwargs
-        )
+        def send_request(delay: float = None) -> AsyncJob:
+            return self._request_handler._submit_endpoint_request(
+                self._endpoint, self._response_callback, delay, args, kwargs
+            )
+
+        self._send_last_request = send_request
+        self._ongoing_async_request = send_request()
         if self.first_request_send_at is None:
-            self.first_request_send_at = self._ongoing_async_request.coroutine_executed_at
+            self.first_request_send_at = self._ongoing_async_request.created_at
 
     def get_result(self) -> Union[MediaFile, Any, None]:
         """
@@ -146,8 +181,7 @@ class EndPointRequest:
         This function waits until the job is finished and returns the server_response.
         :return:
         """
-        while not self.is_finished():
-            time.sleep(0.1)
+        self._finished_event.wait()
         return self
 
     @property
@@ -179,8 +213,14 @@ class EndPointRequest:
         if self.is_finished():
             return self
 
+        # transient errors like rate limits or unavailable gateways are retried with the same request
+        if (async_job_result.status_code in self._retryable_status_codes()
+                and self._retry(retry_after=_get_retry_after_s(async_job_result))):
+            return self
+        self._current_retry_counter = 0
+
         # deal with status errors like Not Found 404 or internal server errors
-        rp = ResponseParser()
+        rp = _RESPONSE_PARSER
         request_status_error = rp.check_response_status(async_job_result)
         if request_status_error is not None:
             self.error = request_status_error
@@ -195,31 +235,34 @@ class EndPointRequest:
             return self
 
         # check if socaity job / runpod job is finished
-        if server_response.status == ServerJobStatus.FINISHED:
-            self.in_between_server_response = None
-            self.server_response = server_response
-            self.finished_on_server_at = copy(self.last_refresh_call_response_at)
-            return self
-        elif server_response.status == ServerJobStatus.FAILED:
-            self.error = server_response.message
-            if server_response.message is None:
-                self.error = "Job failed without error message."
-            self.finished_on_server_at = copy(self.last_refresh_call_response_at)
-            return self
-        elif server_response.status == ServerJobStatus.CANCELLED:
-            self.error = "Job was cancelled."
-            self.server_response = server_response
+        # most responses are refresh responses of running jobs. They only need the single set lookup.
+        status = server_response.status
+        if status in TERMINAL_SERVER_JOB_STATUSES:
             self.finished_on_server_at = copy(self.last_refresh_call_response_at)
+            if status == ServerJobStatus.FINISHED:
+                self.in_between_server_response = None
+                self.server_response = server_response
+            elif status == ServerJobStatus.FAILED:
+                self.error = server_response.message
+                if server_response.message is None:
+                    self.error = "Job failed without error message."
+            elif status == ServerJobStatus.CANCELLED:
+                self.error = "Job was cancelled."
+                self.server_response = server_response
+            else:  # timeout
+                self.error = server_response.message
+                if server_response.message is None:
+                    self.error = "Job timed out on the server."
             return self
 
         #### SERVER JOB NOT TERMINED ####
-        if server_response.status == ServerJobStatus.QUEUED:
+        if status == ServerJobStatus.QUEUED:
             if self.queued_on_server_at is None:
                 self.queued_on_server_at = copy(self.last_refresh_call_response_at)
             else:
                 if self.processing_on_server_at is not None:
                     print(f"Job {self.job_id} was added on queue on server, then removed, then readded to server queue")
-        elif server_response.status == ServerJobStatus.PROCESSING:
+        elif status == ServerJobStatus.PROCESSING:
             if self.processing_on_server_at is None:
                 self.processing_on_server_at = copy(self.last_refresh_call_response_at)
 
@@ -236,73 +279,128 @@ class EndPointRequest:
 
         # if not finished, we need to refresh the job
         # by calling this recursively we can refresh the job until it's finished
-        method = 'GET'
-        if isinstance(server_response, RunpodJobResponse) or isinstance(server_response, SocaityJobResponse):
-            method = 'POST'
+        method = 'POST' if isinstance(server_response, (RunpodJobResponse, SocaityJobResponse)) else 'GET'
 
-        self._ongoing_async_request = self._request_handler.request_url(
+        self._send_last_request = functools.partial(
+            self._request_handler.request_url,
             server_response.refresh_job_url,
             method=method,
-            callback=self._response_callback,
-            delay=self._refresh_interval
+            callback=self._response_callback
         )
+        self._ongoing_async_request = self._send_last_request(delay=self._next_refresh_delay())
 
-    def _deal_with_errors(self, async_job: AsyncJob) -> bool:
+    def _next_refresh_delay(self) -> float:
+        """
+        Exponential backoff with jitter for the status refresh calls.
+        Short jobs are picked up quickly, long-running jobs don't flood the server with status requests.
         """
-        Deals with potential errors. Returns True if the request should be retried.
+        delay = self._refresh_delay
+        self._refresh_delay = min(delay * REFRESH_BACKOFF_FACTOR, self._max_refresh_interval)
+        return delay * random.uniform(1 - REFRESH_JITTER, 1 + REFRESH_JITTER)
 
+    def _retry(self, retry_after: float = None) -> bool:
         """
-        # check if the coroutine had an error
-        if async_job.error is None:
+        Sends the last request again after an exponential backoff with jitter.
+        :param retry_after: delay in seconds requested by the server (Retry-After header). Overrules the backoff.
+            It is clamped to RETRY_MAX_DELAY_S, so a server can't stall the client indefinitely.
+        :return: False if no retries are left.
+        """
+        if self._send_last_request is None or self._current_retry_counter >= self._retries_on_error:
             return False
 
-        # if there's a HTTPStatusError it means, that the server responded with an error 4.xx or 5.xx
-        # in this case we need to decide further.
-        if async_job.error is not HTTPStatusError:
-            traceback.print_exception(type(async_job.error), async_job.error, async_job.error.__traceback__)
-            self.error = async_job.error
-            # TODO: check error details and decide if we retry
-            return False
-        else:  # in case of connection error we try again
-            return True
+        if retry_after is None:
+            retry_after = RETRY_BASE_DELAY_S * 2 ** self._current_retry_counter + random.uniform(0, RETRY_JITTER_S)
+        retry_after = min(max(retry_after, 0.0), RETRY_MAX_DELAY_S)
+
+        self._current_retry_counter += 1
+        self._ongoing_async_request = self._send_last_request(delay=retry_after)
+        return True
+
+    def _is_first_request(self) -> bool:
+        return self.server_response is None and self.in_between_server_response is None
+
+    def _retryable_status_codes(self) -> frozenset:
+        """
+        The first request may create a job on the server. It is only retried on status codes that prove
+        the server did not accept it. Refresh calls only ask for the job status and are retried on all transient errors.
+        """
+        if self._is_first_request():
+            return FIRST_REQUEST_RETRYABLE_STATUS_CODES
+        return RETRYABLE_STATUS_CODES
+
+    def _is_retryable_error(self, error: Exception) -> bool:
+        """
+        Returns True if the request failed because of a transient error and should be sent again.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self._retryable_status_codes()
+
+        if self._is_first_request():
+            # The first request may create a (paid) job on the server. After a read timeout or a dropped connection
+            # the server might have accepted it already, so it is only sent again if it never reached the server.
+            return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+        # refresh calls only ask for the job status and can always be sent again
+        return isinstance(error, (httpx.TimeoutException, httpx.TransportError))
 
     def _response_callback(self, async_job: AsyncJob):
         """
         This function is called when the first async_jobs job is finished.
         It checks if the server_response is a socaity job server_response and sets the status accordingly.
-        :param future: the future object of the async_jobs job
-        :return:
+        :param async_job: the finished async_jobs job
         """
+        self._handle_response(async_job)
+        if self.is_finished():
+            self._finished_event.set()
+        return self
 
+    def _handle_response(self, async_job: AsyncJob):
         # in this case it was the first request response
-        if self.server_response is None and self.in_between_server_response is None:
+        is_first_request = self._is_first_request()
+        if is_first_request:
             self.first_response_received_at = async_job.future_result_received_at
-            # If there was an error on the first request stop
-            if async_job.error:
-                if "Errno 11001" in str(async_job.error):
-                    self.error = (f"Error on first request to {self._endpoint.endpoint_route}: "
-                                  f"Failed to resolve the server address '{self._request_handler.service_address.url}'."
-                                  f" Host not resolvable. Check internet connection and service url. "
-                                  f"Details: {async_job.error}")
-                else:
-                    self.error = f"Error on first request to {self._endpoint.endpoint_route}: {async_job.error}"
-                return self
 
         # normal refresh
         if async_job.error is None:
             return self._parse_result_and_refresh_if_necessary(async_job.result)
 
         # decide if and retry the request.
-        retry = self._deal_with_errors(async_job)
-        if retry:
-            # TODO: implement retry logic for other endpoint types than socaity
-            # for socaity
-            if (self.in_between_server_response is not None
-                    and isinstance(self.in_between_server_response, BaseJobResponse)):
-                self._current_retry_counter += 1
-                if self._current_retry_counter < self._retries_on_error:
-                    # use previous job server_response to retry
-                    return self._parse_result_and_refresh_if_necessary(self.in_between_server_response)
-                else:
-                    self.error = async_job.error
-                    return self
+        if self._is_retryable_error(async_job.error) and self._retry():
+            return self
+
+        # If there was an error on the first request stop
+        if is_first_request:
+            if "Errno 11001" in str(async_job.error):
+                self.error = (f"Error on first request to {self._endpoint.endpoint_route}: "
+                              f"Failed to resolve the server address '{self._request_handler.service_address.url}'."
+                              f" Host not resolvable. Check internet connection and service url. "
+                              f"Details: {async_job.error}")
+            else:
+                self.error = f"Error on first request to {self._endpoint.endpoint_route}: {async_job.error}"
+            return self
+
+        traceback.print_exception(type(async_job.error), async_job.error, async_job.error.__traceback__)
+        self.error = async_job.error
+        return self
+
+
+def _get_retry_after_s(response: httpx.Response) -> Union[float, None]:
+    """
+    Reads the Retry-After header of a response. It is either given in seconds or as http date.
+    :return: the delay in seconds or None if the header is missing or invalid.
+    """
+    retry_after = response.headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    # http dates are in GMT. A date with "-0000" as zone is parsed to a naive datetime.
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from typing import Union, Tuple
 
@@ -7,7 +8,7 @@ from pydantic import BaseModel
 from fastCloud import FastCloud
 from fastCloud.core import BaseUploadAPI
 from fastsdk.jobs.async_jobs.async_job import AsyncJob
-from fastsdk.jobs.async_jobs.async_job_manager import AsyncJobManager
+from fastsdk.jobs.async_jobs.async_job_manager import AsyncJobManager, get_async_job_manager
 from fastsdk.web.definitions.endpoint import EndPoint
 from fastsdk.web.definitions.service_adress import ServiceAddress, create_service_address
 from media_toolkit import MediaFile
@@ -26,7 +27,7 @@ class RequestHandler:
     ):
         """
         :param service_address: The service_address or URL of the service.
-        :param async_job_manager: The async_jobs job manager to use.
+        :param async_job_manager: The async_jobs job manager to use. Defaults to the shared one (get_async_job_manager).
         :param fast_cloud:
             If given: files are uploaded to the cloud provider
                 (azure, s3, replicate, socaity..) and the file is sent as uploaded_file_url to the endpoint
@@ -39,12 +40,11 @@ class RequestHandler:
             service_address = create_service_address(service_address)
 
         self.service_address = service_address
-        self.api_key = api_key
+        self.api_key = api_key  # also sets the precomputed authorization header
 
         # self.service_spec = determine_service_type(self.service_address)
-        # add the async_jobs job manager or create a new one
-        self.async_job_manager = async_job_manager if async_job_manager is not None else AsyncJobManager()
-        self.httpx_client = httpx.AsyncClient()
+        # add the async_jobs job manager or use the shared one
+        self.async_job_manager = async_job_manager if async_job_manager is not None else get_async_job_manager()
 
         self.fast_cloud = fast_cloud
         self.upload_to_cloud_threshold_mb = upload_to_cloud_threshold_mb
@@ -53,6 +53,21 @@ class RequestHandler:
         self._attached_files_format = 'httpx'
         self._attach_files_to = None
 
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        # owned by the async job manager: its connections are bound to the manager's event loop
+        return self.async_job_manager.httpx_client
+
+    @property
+    def api_key(self) -> Union[str, None]:
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, api_key: Union[str, None]):
+        self._api_key = api_key
+        # built once instead of on every request
+        self._auth_headers = {"Authorization": "Bearer " + api_key} if api_key is not None else {}
+
     def set_fast_cloud(self, fast_cloud: FastCloud,
                        upload_to_cloud_threshold_mb: float = None,
                        max_upload_file_size_mb: float = None):
@@ -92,13 +107,16 @@ class RequestHandler:
         # filter out the parameters that are not in the endpoint definition
         return {k: v for k, v in _named_args.items() if k in p_def}
 
-    def _add_authorization_to_headers(self, headers: dict = None):
-        headers = {} if headers is None else headers
-        if self.api_key is not None:
-            headers["Authorization"] = "Bearer " + self.api_key
-        if len(headers) == 0:
-            headers = None
-        return headers
+    def _add_authorization_to_headers(self, headers: dict = None) -> Union[dict, None]:
+        """
+        Returns the headers merged with the authorization header or None if there are no headers at all.
+        The given headers are not modified; they are usually the endpoint definition shared by all request handlers.
+        """
+        if not headers:
+            return self._auth_headers or None
+        if not self._auth_headers:
+            return headers
+        return {**headers, **self._auth_headers}
 
     async def _format_request_params(self, endpoint: EndPoint, *args, **kwargs) -> Tuple[dict, dict, dict, dict]:
         """
@@ -112,7 +130,7 @@ class RequestHandler:
         # Format the parameters
         query_p = self._format_params(endpoint.query_params, *args, **kwargs)
         body_p = self._format_params(endpoint.body_params, *args, **kwargs)
-        file_p = self._format_params(endpoint.file_params, *args, **kwargs)
+        file_p = self._format_params(endpoint.file_params, *args, **kwargs) if endpoint.has_file_params else {}
         headers = self._add_authorization_to_headers(endpoint.headers)
         return query_p, body_p, file_p, headers
 
@@ -122,11 +140,14 @@ class RequestHandler:
         Reads the files to be uploaded into memory.
         :returns dict in form { 'file_name': MediaFile }
         """
-        # ToDo: Make an async version of MediaFile loading to be true async and to load multiple files much faster.
-        return {
-            k: MediaFile().from_any(v)
-            for k, v in files.items()
-        }
+        # MediaFile loading is blocking (disk, url downloads, conversions).
+        # The files are read concurrently in the default thread pool so the event loop with the other requests continues.
+        loop = asyncio.get_running_loop()
+        media_files = await asyncio.gather(*[
+            loop.run_in_executor(None, MediaFile().from_any, v)
+            for v in files.values()
+        ])
+        return dict(zip(files.keys(), media_files))
 
     def _convert_files_to_attachable_format(self, files: dict) -> dict:
         if self._attached_files_format == 'httpx':  # default for fasttaskapi
@@ -151,7 +172,7 @@ class RequestHandler:
             - dict: If files were uploaded. The dict is formatted as { file_name: download_url }.
             - dict: If files are attached. The dict contains the files in a format that can be sent with httpx.
         """
-        if files is None or len(files) == 0:
+        if not files:
             return files
 
         # determine combined file size
@@ -172,7 +193,9 @@ class RequestHandler:
             if isinstance(self.fast_cloud, BaseUploadAPI):
                 uploaded_file_urls = await self.fast_cloud.upload_async(list(files.values()))
             else:
-                uploaded_file_urls = self.fast_cloud.upload(list(files.values()))
+                # the upload is blocking. All services share one event loop, so it runs in the default thread pool.
+                loop = asyncio.get_running_loop()
+                uploaded_file_urls = await loop.run_in_executor(None, self.fast_cloud.upload, list(files.values()))
 
             uploaded_files = dict(zip(files.keys(), uploaded_file_urls))
 
@@ -189,7 +212,7 @@ class RequestHandler:
         :param file_params: The file params to convert.
         :return: converted file params
         """
-        if not file_params or len(file_params) == 0:
+        if not file_params:
             return file_params
 
         # separate files which are provided as "urls" from physical upload files
@@ -201,6 +224,10 @@ class RequestHandler:
             else:
                 upload_file_params[k] = v
 
+        # only urls given -> nothing to read or upload
+        if not upload_file_params:
+            return url_files
+
         # read and upload files
         file_params = await self._read_files(upload_file_params)
         file_params = await self._upload_files(files=file_params)
@@ -215,7 +242,8 @@ class RequestHandler:
 
     async def _prepare_request(self, endpoint: EndPoint, *args, **kwargs):
         query_p, body_p, file_p, headers = await self._format_request_params(endpoint, *args, **kwargs)
-        file_p = await self._process_file_params(file_p)
+        if file_p:
+            file_p = await self._process_file_params(file_p)
 
         # add query parameters to the url like '/endpoint?param1=value1&param2=value2'
         url = self._prepare_request_url(endpoint, query_params=query_p)
@@ -228,10 +256,11 @@ class RequestHandler:
         #x3 = await self.httpx_client.post(url=url, data=data, headers=headers, timeout=timeout)
         # attach files that are urls to the body_params and remove them from file_ps
 
-        url_files = {k: v for k, v in file_p.items() if MediaFile._is_url(v)}
-        body_params.update(url_files)
-        file_p = {k: v for k,v in file_p.items() if k not in url_files}
-        file_p = None if len(file_p) == 0 else file_p
+        if file_p:
+            url_files = {k: v for k, v in file_p.items() if MediaFile._is_url(v)}
+            body_params.update(url_files)
+            file_p = {k: v for k, v in file_p.items() if k not in url_files}
+        file_p = file_p or None
 
         return await self.httpx_client.post(
             url=url, params=query_params, data=body_params, files=file_p, headers=headers, timeout=endpoint.timeout
@@ -246,9 +275,24 @@ class RequestHandler:
         :param kwargs: arbitrary values that are matched with the endpoint def
         :return: An AsyncJob object that can be used to get the result of the request.
         """
+        return self._submit_endpoint_request(endpoint, callback, None, args, kwargs)
+
+    def _submit_endpoint_request(
+            self, endpoint: EndPoint, callback: Union[callable, None], delay: Union[float, None], args: tuple,
+            kwargs: dict
+    ) -> AsyncJob:
+        """
+        Submits the request to the endpoint to the async job manager. Used for example to retry a request with a delay.
+        The endpoint parameters are passed as tuple and dict, so they can't collide with callback and delay.
+        :param endpoint: The endpoint definition.
+        :param callback: The callback function to call when the request is done.
+        :param delay: The delay in seconds before the request is sent. None to send it immediately.
+        :param args: arbitrary values that are matched with the endpoint def
+        :param kwargs: arbitrary values that are matched with the endpoint def
+        :return: An AsyncJob object that can be used to get the result of the request.
+        """
         req_coroutine = self._request_endpoint(endpoint, *args, **kwargs)
-        async_job = self.async_job_manager.submit(req_coroutine, callback=callback, delay=None)
-        return async_job
+        return self.async_job_manager.submit(req_coroutine, callback=callback, delay=delay)
 
     def request_url(
             self,
@@ -272,7 +316,7 @@ class RequestHandler:
         :return: An AsyncJob object that can be used to get the result of the request.
         """
         # for relative paths
-        if "http" not in url:
+        if not url.startswith(("http://", "https://")):
             url = url.lstrip("/")  # remove leading slash
             url = f"{self.service_address.url}/{url}"
 
@@ -1,10 +1,10 @@
-import json
 from typing import Union
 
 from fastCloud import FastCloud, ReplicateUploadAPI
 from fastsdk.jobs.async_jobs.async_job_manager import AsyncJobManager
 from fastsdk.web.definitions.endpoint import EndPoint
 from fastsdk.web.definitions.service_adress import ServiceAddress
+from fastsdk.utils import json_dumps
 from fastsdk.web.req.request_handler import RequestHandler
 
 
@@ -70,7 +70,7 @@ class RequestHandlerReplicate(RequestHandler):
             body_params['version'] = version
 
         # replicate requires the data to be a json input parameter
-        data = json.dumps(body_params)
-        return await self.httpx_client.post(url=url, data=data, headers=headers, timeout=timeout)
+        data = json_dumps(body_params)
+        return await self.httpx_client.post(url=url, content=data, headers=headers, timeout=timeout)
 
 
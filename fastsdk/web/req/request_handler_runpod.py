@@ -1,9 +1,25 @@
-import json
+import functools
 
 from fastsdk.web.definitions.endpoint import EndPoint
+from fastsdk.utils import json_dumps
 from fastsdk.web.req.request_handler import RequestHandler
 
 
+@functools.lru_cache(maxsize=256)
+def _get_runpod_path(endpoint_route: str) -> str:
+    """
+    Derives the fast-task-api path that is sent in the runpod body from the endpoint route.
+    The route might contain the runpod "run/" prefix. It's removed.
+    Computed only once per route instead of on every request.
+    """
+    path = endpoint_route.lstrip("/")
+    if path == "run":
+        return ""
+    if path.startswith("run/"):
+        path = path[len("run/"):]
+    return path
+
+
 class RequestHandlerRunpod(RequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -21,8 +37,7 @@ class RequestHandlerRunpod(RequestHandler):
 
         # Performing a request to the runpod or fast-task-api endpoint with given path
         # path might have double arguments. Cleaning it.
-        path = endpoint.endpoint_route.lstrip("/").lstrip("run/")
-        body_params["path"] = path
+        body_params["path"] = _get_runpod_path(endpoint.endpoint_route)
         # every other param goes into the body_params
         if query_params is not None:
             body_params.update(query_params)
@@ -30,7 +45,7 @@ class RequestHandlerRunpod(RequestHandler):
             body_params.update(file_p)
 
         # runpod expects input data to be in a json object with the key "input"
-        data = json.dumps({"input": body_params})
-        return await self.httpx_client.post(url=url, data=data, headers=headers, timeout=timeout)
+        data = json_dumps({"input": body_params})
+        return await self.httpx_client.post(url=url, content=data, headers=headers, timeout=timeout)
 
 
@@ -1,3 +1,4 @@
+import functools
 import inspect
 import threading
 from typing import Union, Tuple
@@ -13,11 +14,15 @@ from fastsdk.web.definitions.service_adress import (ServiceAddress, SocaityServi
                                                     RunpodServiceAddress, create_service_address)
 from fastsdk.web.req.endpoint_request import EndPointRequest
 
-from fastsdk.registry import Registry
+from fastsdk.registry import registry
+from fastsdk.utils import json_loads
 from fastsdk.web.req.request_handler import RequestHandler
 from fastsdk.web.req.request_handler_replicate import RequestHandlerReplicate
 from fastsdk.web.req.request_handler_runpod import RequestHandlerRunpod
 
+# routes which are used by the socaity protocol itself and therefore can't be added as endpoints
+RESERVED_ENDPOINT_ROUTES = frozenset({"health", "status", "cancel"})
+
 
 class ServiceClient:
     """
@@ -69,6 +74,8 @@ class ServiceClient:
         # endpoint function holders
         self.endpoint_request_funcs = {}  # { endpoint_name: function, endpoint_name_async: function }
         self.endpoints = {}  # { endpoint_name: endpoint }
+        # { (endpoint_route, call_async): function } resolved at registration. Fast path of __call__.
+        self._endpoint_funcs_by_route = {}
 
         # add api keys for authorization
         # If nothing is specified we use the default api keys defined by environment variables
@@ -96,7 +103,7 @@ class ServiceClient:
 
         # add the service client to the registry. This makes it easier to find them later on.
         # Is also used in other packages.
-        Registry().add_service(self.service_name, self)
+        registry.add_service(self.service_name, self)
 
     @property
     def active_service(self) -> str:
@@ -130,17 +137,19 @@ class ServiceClient:
         :return: RequestHandler for the current service
         """
         current_service = self.active_service
-        # Lazy initialize request handler
-        if current_service not in self.request_handlers:
-            # Create request handler
-            self.request_handlers[current_service] = create_request_handler(
+        # single lookup on the hot path. None means not yet created or invalidated by add_api_key.
+        request_handler = self.request_handlers.get(current_service)
+        if request_handler is None:
+            # Lazy initialize request handler
+            request_handler = create_request_handler(
                 service_address=self.service_urls.get(current_service),
                 api_key=self.api_keys.get(current_service),
                 fast_cloud=self.fast_cloud,
                 upload_to_cloud_threshold_mb=self.upload_to_cloud_threshold_mb
             )
+            self.request_handlers[current_service] = request_handler
 
-        return self.request_handlers[current_service]
+        return request_handler
 
     def add_api_key(self, service_name: str, key: str):
         """
@@ -183,6 +192,8 @@ class ServiceClient:
         self.upload_to_cloud_threshold_mb = upload_to_cloud_threshold_mb
 
         for service_name, handler in self.request_handlers.items():
+            if handler is None:
+                continue
             handler.set_fast_cloud(fast_cloud,
                                    upload_to_cloud_threshold_mb=upload_to_cloud_threshold_mb,
                                    max_upload_file_size_mb=max_upload_file_size_mb)
@@ -237,6 +248,7 @@ class ServiceClient:
         endpoint_job_wrapper.__signature__ = inspect.Signature(parameters=sig_params)
         self.__setattr__(func_name, endpoint_job_wrapper)
         self.endpoint_request_funcs[func_name] = endpoint_job_wrapper
+        self._endpoint_funcs_by_route[(endpoint.endpoint_route, is_async)] = endpoint_job_wrapper
 
         return endpoint_job_wrapper
 
@@ -264,7 +276,8 @@ class ServiceClient:
             body_params: Union[dict, BaseModel] = None,
             file_params: dict = None,
             timeout: int = 3600,
-            refresh_interval_s: float = 0.5
+            refresh_interval_s: float = 0.5,
+            max_refresh_interval_s: float = 5.0
     ):
         """
         :param endpoint_route: for example api/img2img/stable_diffusion
@@ -275,9 +288,11 @@ class ServiceClient:
         :param file_params: Defines the parameters which are send as files. Might be, read, converted, uploaded.
         :param timeout: time in seconds until the request to the endpoint fails.
         :param refresh_interval_s: in which interval in seconds is the status checkpoint called.
+            The interval grows with every refresh call (exponential backoff) until max_refresh_interval_s is reached.
+        :param max_refresh_interval_s: upper bound in seconds for the refresh interval.
         """
         endpoint_route = endpoint_route.strip("/")
-        if endpoint_route in ["health", "status", "cancel"]:
+        if endpoint_route in RESERVED_ENDPOINT_ROUTES:
             print(f"Endpoint name {endpoint_route} is reserved and can't be used. We ignore it")
             return
 
@@ -290,7 +305,8 @@ class ServiceClient:
             body_params=body_params,
             file_params=file_params,
             timeout=timeout,
-            refresh_interval_s=refresh_interval_s
+            refresh_interval_s=refresh_interval_s,
+            max_refresh_interval_s=max_refresh_interval_s
         )
         self._add_endpoint(ep)
 
@@ -299,23 +315,23 @@ class ServiceClient:
         List all available endpoints of the service with their parameters.
         :return: a list of endpoint names
         """
-        for name, func in self.endpoint_request_funcs.items():
-            print(f"{name}: {func.__signature__}")
+        # build the report first and print it in one go instead of one write per endpoint
+        print("\n".join(f"{name}: {func.__signature__}" for name, func in self.endpoint_request_funcs.items()))
         return self.endpoint_request_funcs
 
     @staticmethod
     def _create_service_urls(service_urls: Union[dict, str, list]):
-        # set service urls and fix them if necessary
+        # set service urls and fix them if necessary.
+        # str, list and ServiceAddress are already converted here and don't need the second pass.
         if isinstance(service_urls, str):
-            service_urls = {"0": create_service_address(service_urls)}
-        elif isinstance(service_urls, list):
-            service_urls = {str(i): create_service_address(url) for i, url in enumerate(service_urls)}
-        elif isinstance(service_urls, ServiceAddress):
-            service_urls = {"0": service_urls}
+            return {"0": create_service_address(service_urls)}
+        if isinstance(service_urls, list):
+            return {str(i): create_service_address(url) for i, url in enumerate(service_urls)}
+        if isinstance(service_urls, ServiceAddress):
+            return {"0": service_urls}
 
         # fix problems with "handwritten" urls
-        service_urls = { k: create_service_address(addr) for k, addr in service_urls.items() }
-        return service_urls
+        return {k: create_service_address(addr) for k, addr in service_urls.items()}
 
     def __call__(self, endpoint_route: str, call_async: bool = False, *args, **kwargs) -> EndPointRequest:
         """
@@ -327,6 +343,11 @@ class ServiceClient:
         :param kwargs: Keyword arguments for the endpoint
         :return: EndPointRequest object
         """
+        # the common case: the route is given as registered.
+        endpoint_func = self._endpoint_funcs_by_route.get((endpoint_route, call_async))
+        if endpoint_func is not None:
+            return endpoint_func(*args, **kwargs)
+
         # Get the endpoint
         if call_async:
             endpoint_route = endpoint_route.strip("/")
@@ -343,11 +364,21 @@ class ServiceClient:
         Remove the service from the registry when the object is deleted.
         """
         try:
-            Registry().remove_service(self)
+            registry.remove_service(self)
         except Exception as e:
             pass
 
 
+# request handler class per detected endpoint specification. Unknown specifications use the default RequestHandler.
+_REQUEST_HANDLER_BY_SPECIFICATION = {
+    EndpointSpecification.SOCAITY: RequestHandler,
+    EndpointSpecification.FASTTASKAPI: RequestHandler,
+    EndpointSpecification.RUNPOD: RequestHandlerRunpod,
+    EndpointSpecification.REPLICATE: RequestHandlerReplicate,
+    EndpointSpecification.OTHER: RequestHandler
+}
+
+
 def create_request_handler(
         service_address: [str, ServiceAddress, SocaityServiceAddress, RunpodServiceAddress, ReplicateServiceAddress],
         api_key: str = None,
@@ -385,20 +416,10 @@ def create_request_handler(
                 fast_cloud = SocaityUploadAPI(api_key=api_key)
     else:
         st = determine_service_type_from_api_spec(service_address.url)
-        ep_req = {
-            EndpointSpecification.SOCAITY: RequestHandler,
-            EndpointSpecification.FASTTASKAPI: RequestHandler,
-            EndpointSpecification.RUNPOD: RequestHandlerRunpod,
-            EndpointSpecification.REPLICATE: RequestHandlerReplicate,
-            EndpointSpecification.OTHER: RequestHandler
-        }
-        if st not in ep_req:
-            st = EndpointSpecification.OTHER
-
         if st == EndpointSpecification.RUNPOD:  # needed in localhost deploy
             service_address = RunpodServiceAddress(service_address.url)
 
-        _rqh = ep_req[st]
+        _rqh = _REQUEST_HANDLER_BY_SPECIFICATION.get(st, RequestHandler)
 
     return _rqh(
         service_address=service_address,
@@ -415,13 +436,54 @@ def determine_service_type_from_api_spec(service_url: str) -> EndpointSpecificat
     :param parse_open_api_definition:
         If true and the type can't be determined from the url alone, the openapi.json is parsed to check for fasttaskapi
     """
-    # try to get openapi.json to determine the service type
+    parsed = urlparse(service_url)
+    return _determine_service_type_from_openapi_url(f"{parsed.scheme}://{parsed.netloc}/openapi.json")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openapi_http_client() -> httpx.Client:
+    """
+    A single, lazily created httpx client for the openapi.json probes.
+    Connections are pooled across probes instead of opening (and leaking) a new client per call.
+    """
+    return httpx.Client()
+
+
+# { openapi_url: EndpointSpecification } of hosts that answered the openapi.json probe with 2xx or 404
+_SERVICE_TYPE_BY_OPENAPI_URL = {}
+
+
+def _determine_service_type_from_openapi_url(openapi_url: str) -> EndpointSpecification:
+    """
+    Fetches and inspects the openapi.json of a host.
+    Cached per url, because every request handler of the same host would otherwise download and parse the same spec.
+    Only definite answers of the host (2xx or 404) are cached. If the request fails (timeout, dns, ...) or the host
+    answers with another status (e.g. 502/503 while it is starting), the next call probes again.
+    """
+    service_type = _SERVICE_TYPE_BY_OPENAPI_URL.get(openapi_url)
+    if service_type is not None:
+        return service_type
+
     try:
-        parsed = urlparse(service_url)
-        openapi_json = httpx.Client().get(f"{parsed.scheme}://{parsed.netloc}/openapi.json").json()
-    except Exception as e:
+        response = _get_openapi_http_client().get(openapi_url)
+    except Exception:
+        # host not reachable right now. Treat it as a normal non-openapi service for this call only.
+        return EndpointSpecification.OTHER
+
+    service_type = _parse_service_type_from_openapi_response(response)
+    if response.is_success or response.status_code == 404:
+        _SERVICE_TYPE_BY_OPENAPI_URL[openapi_url] = service_type
+    return service_type
+
+
+def _parse_service_type_from_openapi_response(response: httpx.Response) -> EndpointSpecification:
+    try:
+        openapi_json = json_loads(response.content)
+    except Exception:
         # must be a normal non-openapi service
         return EndpointSpecification.OTHER
+    if not isinstance(openapi_json, dict):
+        return EndpointSpecification.OTHER
     detail = openapi_json.get('detail', None)
     if detail is not None and 'not found' in detail:
         # Any other non-openapi service
@@ -0,0 +1,156 @@
+import asyncio
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+
+from fastsdk.jobs.async_jobs.async_job import AsyncJob
+from fastsdk.web.definitions.endpoint import EndPoint
+from fastsdk.web.req.request_handler import RequestHandler
+from fastsdk.web.req.endpoint_request import EndPointRequest, RETRY_BASE_DELAY_S, RETRY_JITTER_S, \
+    RETRY_MAX_DELAY_S, REFRESH_JITTER, MIN_REFRESH_INTERVAL_S, _get_retry_after_s
+
+
+class _RecordingRequestHandler:
+    """
+    Stands in for the RequestHandler. Records the delay of every sent request instead of sending it.
+    """
+    def __init__(self):
+        self.delays = []
+
+    def _submit_endpoint_request(self, endpoint, callback, delay, args, kwargs):
+        self.delays.append(delay)
+        return AsyncJob(future=None, coro=None)
+
+
+class _RecordingAsyncJobManager:
+    """
+    Stands in for the AsyncJobManager. Records the submitted coroutines and delays instead of running them.
+    """
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, coro, callback=None, delay=None):
+        self.submitted.append((coro, delay))
+        return AsyncJob(future=None, coro=coro)
+
+
+def _finished_async_job(result=None, error=None) -> AsyncJob:
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return AsyncJob(future=future, coro=None)
+
+
+def _response(status_code: int, headers: dict = None, json: dict = None) -> httpx.Response:
+    return httpx.Response(status_code, headers=headers, json=json, request=httpx.Request("POST", "http://test/api"))
+
+
+def _send_request(retries_on_error: int = 3):
+    handler = _RecordingRequestHandler()
+    endpoint_request = EndPointRequest(EndPoint("api"), handler, retries_on_error=retries_on_error)
+    endpoint_request.request()
+    return endpoint_request, handler
+
+
+def test_retry_on_503():
+    endpoint_request, handler = _send_request()
+
+    endpoint_request._response_callback(_finished_async_job(_response(503)))
+    assert not endpoint_request.is_finished()
+    assert len(handler.delays) == 2
+    assert RETRY_BASE_DELAY_S <= handler.delays[1] <= RETRY_BASE_DELAY_S + RETRY_JITTER_S
+
+    endpoint_request._response_callback(_finished_async_job(_response(200, json={"ok": True})))
+    assert endpoint_request.is_finished()
+    assert endpoint_request.error is None
+    assert endpoint_request.server_response == {"ok": True}
+
+
+def test_give_up_after_max_retries():
+    endpoint_request, handler = _send_request(retries_on_error=2)
+
+    for _ in range(3):
+        endpoint_request._response_callback(_finished_async_job(_response(503)))
+
+    assert len(handler.delays) == 3  # first request and two retries
+    assert endpoint_request.is_finished()
+    assert endpoint_request.error is not None
+
+
+def test_retry_after_is_honoured_and_clamped():
+    endpoint_request, handler = _send_request()
+
+    endpoint_request._response_callback(_finished_async_job(_response(429, headers={"Retry-After": "2"})))
+    assert handler.delays[-1] == 2.0
+
+    endpoint_request._response_callback(_finished_async_job(_response(429, headers={"Retry-After": "3600"})))
+    assert handler.delays[-1] == RETRY_MAX_DELAY_S
+
+
+def test_retry_after_http_date():
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    # usegmt=False formats the zone as "-0000", which is parsed to a naive datetime
+    for header in (format_datetime(retry_at, usegmt=True), format_datetime(retry_at.replace(tzinfo=None))):
+        assert 25 <= _get_retry_after_s(_response(503, headers={"Retry-After": header})) <= 30
+
+    assert _get_retry_after_s(_response(503, headers={"Retry-After": "soon"})) is None
+    assert _get_retry_after_s(_response(503)) is None
+
+
+def test_first_request_is_only_retried_if_it_did_not_reach_the_server():
+    endpoint_request, handler = _send_request()
+    endpoint_request._response_callback(_finished_async_job(error=httpx.ConnectError("refused")))
+    assert len(handler.delays) == 2
+    assert not endpoint_request.is_finished()
+
+    # after a read timeout the server may already have created the job. Sending it again would duplicate it.
+    endpoint_request, handler = _send_request()
+    endpoint_request._response_callback(_finished_async_job(error=httpx.ReadTimeout("read timeout")))
+    assert len(handler.delays) == 1
+    assert endpoint_request.is_finished()
+
+    # a gateway timeout means the gateway forwarded the request. The upstream may have created the job, too.
+    for status_code in (408, 502, 504):
+        endpoint_request, handler = _send_request()
+        endpoint_request._response_callback(_finished_async_job(_response(status_code)))
+        assert len(handler.delays) == 1
+        assert endpoint_request.is_finished()
+        assert endpoint_request.error is not None
+
+
+def test_refresh_calls_are_retried_on_gateway_errors():
+    endpoint_request, handler = _send_request()
+    endpoint_request.in_between_server_response = object()  # the job was created, now its status is refreshed
+    endpoint_request._response_callback(_finished_async_job(_response(504)))
+    assert len(handler.delays) == 2
+    assert not endpoint_request.is_finished()
+
+
+def test_endpoint_parameter_named_delay():
+    manager = _RecordingAsyncJobManager()
+    handler = RequestHandler("http://test", async_job_manager=manager)
+    endpoint = EndPoint("tts", body_params={"text": str, "delay": float})
+
+    async def _format_body(endpoint, *args, **kwargs):
+        return handler._format_params(endpoint.body_params, *args, **kwargs)
+    handler._request_endpoint = _format_body
+
+    handler.request_endpoint(endpoint, None, text="hi", delay=0.5)
+    EndPointRequest(endpoint, handler).request("hi", 0.5)
+
+    for coro, delay in manager.submitted:
+        assert delay is None
+        assert asyncio.run(coro) == {"text": "hi", "delay": 0.5}
+
+
+def test_refresh_delay_backoff_is_bounded():
+    endpoint_request = EndPointRequest(EndPoint("api", refresh_interval_s=0, max_refresh_interval_s=2), None)
+    delays = [endpoint_request._next_refresh_delay() for _ in range(10000)]
+
+    assert delays[0] >= MIN_REFRESH_INTERVAL_S * (1 - REFRESH_JITTER)
+    assert max(delays) <= 2 * (1 + REFRESH_JITTER)
+    assert delays[-1] >= 2 * (1 - REFRESH_JITTER)
@@ -0,0 +1,61 @@
+from fastsdk.fast_sdk import fastJob
+from fastsdk.jobs.threaded.internal_job import InternalJob
+
+
+class _FastSDKClass:
+    """
+    Stands in for a class decorated with fastSDK, without a service client.
+    """
+    _is_fast_sdk_class = True
+    start_jobs_immediately = True
+
+    def request(self, endpoint_route: str, call_async=True, *args, **kwargs):
+        raise NotImplementedError()
+
+    @fastJob
+    def named_job(self, a, b=2, job=None, **kwargs):
+        return a, b, job, kwargs
+
+    @fastJob
+    def annotated_job(self, x, tracker: "InternalJob"):
+        return x, tracker
+
+    @fastJob
+    def capitalized_job(self, x, Job):
+        return x, Job
+
+
+def test_fast_job_params():
+    instance = _FastSDKClass()
+
+    job = instance.named_job(1)
+    assert job.get_result(print_progress=False) == (1, 2, job, {})
+
+    job = instance.named_job(1, b=3, c=4)
+    assert job.get_result(print_progress=False) == (1, 3, job, {"c": 4})
+
+    job = instance.named_job(a=5, d=6)
+    assert job.get_result(print_progress=False) == (5, 2, job, {"d": 6})
+
+
+def test_fast_job_param_by_annotation_and_name():
+    instance = _FastSDKClass()
+
+    job = instance.annotated_job(3)
+    assert isinstance(job, InternalJob)
+    assert job.get_result(print_progress=False) == (3, job)
+
+    job = instance.capitalized_job(x=4)
+    assert job.get_result(print_progress=False) == (4, job)
+
+
+def test_format_traceback_of_failed_job():
+    def fail():
+        raise ValueError("boom")
+
+    job = InternalJob(fail, {})
+    assert job.format_traceback() is None
+
+    job.run_sync()
+    assert job.get_result(print_progress=False, throw_error=False) is None
+    assert "ValueError: boom" in job.format_traceback()